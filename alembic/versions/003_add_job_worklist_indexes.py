@@ -0,0 +1,49 @@
+"""Add worklist indexes for the scheduler job queries
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-08-31
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Transcribe/retry worklists: pending voicemails filtered by duration
+    op.create_index(
+        'ix_calls_transcription_pending',
+        'calls',
+        ['transcription_status', 'duration'],
+        postgresql_where=sa.text("status = 'voicemail'"),
+    )
+
+    # Summarize worklist: completed transcriptions without a summary yet
+    op.create_index(
+        'ix_calls_summary_pending',
+        'calls',
+        ['transcription_status'],
+        postgresql_where=sa.text('summary IS NULL'),
+    )
+
+    # Email worklist: pending notifications, optionally cutoff-filtered by date
+    op.create_index(
+        'ix_calls_email_pending',
+        'calls',
+        ['email_status', 'started_at'],
+        postgresql_where=sa.text("email_status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_calls_email_pending', table_name='calls')
+    op.drop_index('ix_calls_summary_pending', table_name='calls')
+    op.drop_index('ix_calls_transcription_pending', table_name='calls')
@@ -22,14 +22,18 @@ class Settings(BaseSettings):
     # OpenRouter API
     openrouter_base_url: str = "https://openrouter.ai/api/v1"
     openrouter_model: str = "google/gemini-3-pro-preview"
+    # Optional cheaper model for short transcripts; empty = always use openrouter_model
+    openrouter_model_small: str = ""
 
     # File storage
     voicemail_storage_path: str = "/app/data/voicemails"
+    llm_cache_path: str = "/app/data/llm_cache"  # Persistent transcript->summary cache
 
     # Postmark Email (for voicemail notifications)
     postmark_api_token: str = ""
     email_from: str = ""  # Must be verified in Postmark
     email_from_name: str = "Phone App"
+    postmark_template_alias: str = ""  # If set, Postmark renders the email server-side
 
     # Base URL for links in emails (e.g., https://phone.example.com)
     base_url: str = "http://localhost:9000"
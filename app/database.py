@@ -4,7 +4,9 @@ from app.config import get_settings
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url)
+# query_cache_size: headroom over the default 500 so the scheduler's
+# recurring statements never get evicted from the compiled-SQL cache
+engine = create_engine(settings.database_url, query_cache_size=1200)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -116,6 +116,11 @@ async def lifespan(app: FastAPI):
     if scheduler:
         scheduler.shutdown()
 
+    # Close the shared keep-alive HTTP client
+    from app.services.http_client import close_http_client
+
+    await close_http_client()
+
 
 app = FastAPI(
     title="Phone API",
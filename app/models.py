@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean, Float, Text, DateTime, func, UniqueConstraint
+from sqlalchemy import Column, String, Integer, Boolean, Float, Text, DateTime, func, Index, UniqueConstraint, text
 from app.database import Base
 
 
@@ -21,6 +21,25 @@ class Call(Base):
     __tablename__ = "calls"
     __table_args__ = (
         UniqueConstraint('provider', 'external_id', name='uq_provider_external_id'),
+        # Worklist indexes for the scheduler jobs: each limit(10) query is
+        # an index range scan instead of a full-table scan as calls grows.
+        # Partial (WHERE) clauses apply on PostgreSQL; other backends build
+        # them as plain composite indexes.
+        Index(
+            'ix_calls_transcription_pending',
+            'transcription_status', 'duration',
+            postgresql_where=text("status = 'voicemail'"),
+        ),
+        Index(
+            'ix_calls_summary_pending',
+            'transcription_status',
+            postgresql_where=text('summary IS NULL'),
+        ),
+        Index(
+            'ix_calls_email_pending',
+            'email_status', 'started_at',
+            postgresql_where=text("email_status = 'pending'"),
+        ),
     )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
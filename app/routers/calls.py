@@ -236,8 +236,8 @@ def get_listen_url(voicemail_id: int, db: Session = Depends(get_db)):
     """Get the public listen URL with access token for a voicemail."""
     from app.services.access_token import get_public_url
 
-    call = db.query(Call).filter(Call.id == voicemail_id).first()
-    if not call:
+    # Pure existence check: only the PK needs to cross the wire
+    if db.query(Call.id).filter(Call.id == voicemail_id).first() is None:
         raise HTTPException(status_code=404, detail="Voicemail not found")
 
     return {"url": get_public_url(voicemail_id)}
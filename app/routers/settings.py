@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 from app.database import get_db
 from app.models import Setting
 from app.schemas import SettingResponse, SettingUpdate, SettingsResponse
+from app.services.scheduler import clear_setting_cache
 
 router = APIRouter(prefix="/settings", tags=["settings"])
 
@@ -42,6 +43,9 @@ def update_setting(key: str, update: SettingUpdate, db: Session = Depends(get_db
     db.commit()
     db.refresh(setting)
 
+    # The scheduler caches settings; drop the stale entry after this direct write
+    clear_setting_cache()
+
     # If sync interval changed, reschedule the job
     if key == "sync_interval_minutes":
         from app.main import scheduler
@@ -139,7 +143,7 @@ async def reprocess_voicemail(voicemail_id: int, db: Session = Depends(get_db)):
         call.corrected_text = summary_result.corrected_text
         call.summary = summary_result.summary
         call.summary_en = summary_result.summary_en
-        call.summary_model = openrouter.model
+        call.summary_model = summary_result.model
         call.summarized_at = datetime.now(timezone.utc)
         call.sentiment = summary_result.sentiment
         call.emotion = summary_result.emotion
@@ -162,6 +166,7 @@ async def reprocess_voicemail(voicemail_id: int, db: Session = Depends(get_db)):
                 api_token=settings.postmark_api_token,
                 from_email=settings.email_from,
                 from_name=settings.email_from_name,
+                template_alias=settings.postmark_template_alias,
             )
             email_data = voicemail_to_email_data(call, settings.base_url)
             success = await email_service.send(to_email=to_email, data=email_data)
@@ -208,6 +213,7 @@ async def set_email_cutoff_now(db: Session = Depends(get_db)):
     ).update({"email_status": "skipped"})
 
     db.commit()
+    clear_setting_cache()
 
     return {
         "cutoff_date": now.isoformat(),
@@ -254,6 +260,7 @@ async def send_email(voicemail_id: int, db: Session = Depends(get_db)):
         api_token=settings.postmark_api_token,
         from_email=settings.email_from,
         from_name=settings.email_from_name,
+        template_alias=settings.postmark_template_alias,
     )
 
     email_data = voicemail_to_email_data(call, settings.base_url)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Query
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 import time
@@ -9,6 +10,7 @@ from app.schemas import SyncResponse, TranscribeResponse, SummarizeResponse
 from app.services.placetel import PlacetelService
 from app.services.elevenlabs import ElevenLabsService
 from app.services.openrouter import OpenRouterService
+from app.services.scheduler import clear_setting_cache
 
 router = APIRouter(tags=["sync"])
 
@@ -32,7 +34,9 @@ async def sync_voicemails(
 
     for vm_data in voicemails:
         external_id = str(vm_data["id"])
-        existing = db.query(Call).filter(
+        # Only the two columns the dedup/refresh check reads, rather than
+        # hydrating the full row (with its TEXT columns) per voicemail
+        existing = db.query(Call.id, Call.file_url).filter(
             Call.external_id == external_id,
             Call.provider == "placetel"
         ).first()
@@ -43,7 +47,11 @@ async def sync_voicemails(
         if existing:
             # Update existing record if file_url changed (it expires)
             if existing.file_url != vm_data.get("file_url"):
-                existing.file_url = vm_data.get("file_url")
+                db.execute(
+                    update(Call)
+                    .where(Call.id == existing.id)
+                    .values(file_url=vm_data.get("file_url"))
+                )
                 updated_count += 1
         else:
             # Determine initial status based on duration
@@ -99,6 +107,9 @@ async def sync_voicemails(
 
     db.commit()
 
+    # The scheduler caches settings; drop the stale entry after this direct write
+    clear_setting_cache()
+
     return SyncResponse(
         synced=len(voicemails),
         new=new_count,
@@ -245,7 +256,7 @@ async def summarize_voicemail(voicemail_id: int, db: Session = Depends(get_db)):
         call.corrected_text = result.corrected_text
         call.summary = result.summary
         call.summary_en = result.summary_en
-        call.summary_model = openrouter.model
+        call.summary_model = result.model
         call.summarized_at = datetime.now(timezone.utc)
         call.sentiment = result.sentiment
         call.emotion = result.emotion
@@ -312,7 +323,7 @@ async def summarize_pending(
             call.corrected_text = result.corrected_text
             call.summary = result.summary
             call.summary_en = result.summary_en
-            call.summary_model = openrouter.model
+            call.summary_model = result.model
             call.summarized_at = datetime.now(timezone.utc)
             call.sentiment = result.sentiment
             call.emotion = result.emotion
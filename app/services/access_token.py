@@ -24,6 +24,10 @@ def generate_access_token(voicemail_id: int) -> str:
 
 def verify_access_token(voicemail_id: int, token: str) -> bool:
     """Verify a public access token for a voicemail."""
+    # Tokens are always 32 hex chars; reject malformed input before paying
+    # for the HMAC recompute (scanners hit this path with arbitrary junk).
+    if not isinstance(token, str) or len(token) != 32:
+        return False
     expected = generate_access_token(voicemail_id)
     return hmac.compare_digest(token, expected)
 
@@ -1,8 +1,13 @@
 import httpx
+import orjson
 from pathlib import Path
 from dataclasses import dataclass
 from typing import Optional
 from app.config import get_settings
+from app.services.http_client import get_http_client
+
+# Uploading and transcribing a long recording can take a while
+_TRANSCRIBE_TIMEOUT = httpx.Timeout(120.0, connect=5.0)
 
 
 @dataclass
@@ -27,38 +32,46 @@ class ElevenLabsService:
         """Transcribe an audio file using ElevenLabs Scribe v2."""
         path = Path(file_path)
 
-        if not path.exists():
-            raise FileNotFoundError(f"Audio file not found: {file_path}")
+        # No exists() precheck - let open() raise directly so a missing
+        # file costs one syscall instead of a stat + open pair.
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Audio file not found: {file_path}") from None
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            with open(path, "rb") as f:
-                files = {"file": (path.name, f, "audio/mpeg")}
-                data = {"model_id": self.model}
+        with f:
+            files = {"file": (path.name, f, "audio/mpeg")}
+            data = {"model_id": self.model}
 
-                response = await client.post(
-                    f"{self.base_url}/speech-to-text",
-                    headers=self.headers,
-                    files=files,
-                    data=data,
-                )
+            # Shared client: transcriptions in one batch reuse the same
+            # connection instead of paying a TLS handshake per file.
+            response = await get_http_client().post(
+                f"{self.base_url}/speech-to-text",
+                headers=self.headers,
+                files=files,
+                data=data,
+                timeout=_TRANSCRIBE_TIMEOUT,
+            )
 
-            if response.status_code != 200:
-                error_detail = response.json().get("detail", {})
-                if isinstance(error_detail, dict) and error_detail.get("status") == "audio_too_short":
-                    return TranscriptionResult(
-                        text="[Audio too short to transcribe]",
-                        language="unknown",
-                        confidence=0.0,
-                        model=self.model,
-                    )
-                raise Exception(f"Transcription failed: {response.text}")
+        if response.status_code != 200:
+            error_detail = orjson.loads(response.content).get("detail", {})
+            if isinstance(error_detail, dict) and error_detail.get("status") == "audio_too_short":
+                return TranscriptionResult(
+                    text="[Audio too short to transcribe]",
+                    language="unknown",
+                    confidence=0.0,
+                    model=self.model,
+                )
+            raise Exception(f"Transcription failed: {response.content[:500]!r}")
 
-            result = response.json()
+        # Parse raw bytes directly; response.json() would first decode
+        # the whole body (including word timestamps) into a str.
+        result = orjson.loads(response.content)
 
-            return TranscriptionResult(
-                text=result.get("text", ""),
-                language=result.get("language_code", "unknown"),
-                confidence=result.get("language_probability", 0.0),
-                model=self.model,
-                words=result.get("words"),
-            )
+        return TranscriptionResult(
+            text=result.get("text", ""),
+            language=result.get("language_code", "unknown"),
+            confidence=result.get("language_probability", 0.0),
+            model=self.model,
+            words=result.get("words"),
+        )
@@ -4,22 +4,55 @@ Email service for voicemail notifications using Postmark.
 Generates beautiful HTML emails with voicemail details.
 """
 
-import httpx
+import asyncio
 import base64
+import orjson
+import re
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from html import escape
 from pathlib import Path
-from typing import Optional
+from typing import NamedTuple, Optional
 import logging
 
+from app.services.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 POSTMARK_API_URL = "https://api.postmarkapp.com/email"
+POSTMARK_TEMPLATE_API_URL = "https://api.postmarkapp.com/email/withTemplate"
+
+# Read size for streaming base64 encoding; a multiple of 3 so each chunk
+# encodes without padding and the pieces concatenate cleanly.
+_B64_CHUNK_BYTES = 3 * 64 * 1024
+
+
+def _encode_audio_attachment(path_str: str) -> Optional[str]:
+    """Base64-encode an audio file chunk-wise.
 
+    Avoids holding the raw MP3 and its full base64 copy in memory at the
+    same time, which for a long voicemail roughly halves peak usage.
+    Returns None if the file is missing.
+    """
+    path = Path(path_str)
+    if not path.exists():
+        return None
 
-@dataclass
+    encoded = bytearray()
+    with open(path, "rb") as src:
+        while chunk := src.read(_B64_CHUNK_BYTES):
+            encoded += base64.b64encode(chunk)
+    return encoded.decode("ascii")
+
+@dataclass(frozen=True, slots=True)
 class VoicemailEmailData:
-    """Data needed to generate a voicemail email."""
+    """Data needed to generate a voicemail email.
+
+    Frozen (and therefore hashable) so rendered bodies can be memoized:
+    retries and multi-recipient fanout reuse the same instance. Slotted,
+    so the ~15 attribute reads per render skip the __dict__ lookup.
+    """
     id: int
     from_number: str
     to_number: str
@@ -46,56 +79,108 @@ def format_duration(seconds: int) -> str:
     return f"{seconds // 3600}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
 
 
+# Recognizes German dial strings (+49..., 0049..., 0...) and generic
+# international prefixes (00<cc>...) in a single pass, replacing the old
+# chain of startswith checks and intermediate string slices.
+_PHONE_RE = re.compile(r"^(?:(?:\+49|0049|0(?!0))(?P<de>\d+)|00(?P<intl>\d+))$")
+
+# Digit grouping for German numbers, keyed by minimum length: first matching
+# row wins. New groupings (other lengths or country codes) are table rows,
+# not new branches in format_phone.
+_DE_GROUPING = (
+    # Mobile numbers (176, 177, 178, 179, 151, 152, 157, 160, 162, 163, 170, 171, 172, 173, 174, 175)
+    (10, (3, 7)),
+    # Shorter numbers
+    (7, (3,)),
+)
+
+
 def format_phone(number: str) -> str:
     """Format phone number for display with international format."""
     if not number:
         return "Unknown"
 
-    # Normalize to +49 format
     clean = number.strip()
-    if clean.startswith("0049"):
-        clean = "+49" + clean[4:]
-    elif clean.startswith("00"):
-        clean = "+" + clean[2:]
-    elif clean.startswith("0") and not clean.startswith("+"):
-        clean = "+49" + clean[1:]
+    m = _PHONE_RE.match(clean)
+    if m is None:
+        # Already formatted, foreign +cc, or not a dial string - leave as-is
+        return clean
+
+    intl = m["intl"]
+    if intl is not None:
+        return "+" + intl
 
     # Add spaces for readability (German mobile: +49 176 1234 5678)
-    if clean.startswith("+49"):
-        rest = clean[3:]
-        if len(rest) >= 10:
-            # Mobile numbers (176, 177, 178, 179, 151, 152, 157, 160, 162, 163, 170, 171, 172, 173, 174, 175)
-            return f"+49 {rest[:3]} {rest[3:7]} {rest[7:]}"
-        elif len(rest) >= 7:
-            # Shorter numbers
-            return f"+49 {rest[:3]} {rest[3:]}"
-        else:
-            return f"+49 {rest}"
+    rest = m["de"]
+    for min_len, cuts in _DE_GROUPING:
+        if len(rest) >= min_len:
+            groups = [rest[i:j] for i, j in zip((0,) + cuts, cuts + (None,))]
+            return "+49 " + " ".join(groups)
+    return f"+49 {rest}"
+
+
+class _RenderContext(NamedTuple):
+    """Display fields derived from VoicemailEmailData, computed once per send.
+
+    The subject line, HTML body, and plain body all need the same formatted
+    caller/duration/date values; building them here avoids formatting each
+    value up to three times per email.
+    """
+    caller: str
+    destination: str
+    duration: str
+    received_html: str   # German long form for the HTML body
+    received_plain: str  # Plain-text body form
+    received_short: str  # Compact form for the subject line
+
+
+def _build_render_context(data: "VoicemailEmailData") -> _RenderContext:
+    """Compute the shared display fields for one voicemail."""
+    return _RenderContext(
+        caller=format_phone(data.from_number),
+        destination=data.to_number_name or format_phone(data.to_number),
+        duration=format_duration(data.duration),
+        received_html=data.received_at.strftime("%d.%m.%Y um %H:%M Uhr"),
+        received_plain=data.received_at.strftime("%d.%m.%Y at %H:%M"),
+        received_short=data.received_at.strftime("%d.%m.%Y %H:%M"),
+    )
+
 
-    return clean
+# Badge lookup tables, built once at import instead of per call. The badge
+# inputs form a small closed set, so the two formatted variants are also
+# memoized below.
+_PRIORITY_BADGES = {
+    "high": '<span style="background-color: #fee2e2; color: #dc2626; padding: 4px 12px; border-radius: 9999px; font-size: 12px; font-weight: 600;">High Priority</span>',
+    "low": '<span style="background-color: #f3f4f6; color: #6b7280; padding: 4px 12px; border-radius: 9999px; font-size: 12px; font-weight: 600;">Low Priority</span>',
+}
+
+_SENTIMENT_COLORS = {
+    "positive": ("#dcfce7", "#16a34a"),
+    "negative": ("#fee2e2", "#dc2626"),
+    "neutral": ("#f3f4f6", "#6b7280"),
+}
+
+_CATEGORY_LABELS = {
+    "sales_inquiry": "Sales Inquiry",
+    "existing_order": "Existing Order",
+    "new_inquiry": "New Inquiry",
+    "complaint": "Complaint",
+    "general": "General",
+}
 
 
 def get_priority_badge(priority: Optional[str]) -> str:
     """Generate priority badge HTML."""
-    if priority == "high":
-        return '<span style="background-color: #fee2e2; color: #dc2626; padding: 4px 12px; border-radius: 9999px; font-size: 12px; font-weight: 600;">High Priority</span>'
-    elif priority == "low":
-        return '<span style="background-color: #f3f4f6; color: #6b7280; padding: 4px 12px; border-radius: 9999px; font-size: 12px; font-weight: 600;">Low Priority</span>'
-    return ""
+    return _PRIORITY_BADGES.get(priority, "")
 
 
+@lru_cache(maxsize=64)
 def get_sentiment_indicator(sentiment: Optional[str], emotion: Optional[str]) -> str:
     """Generate sentiment/emotion indicator."""
     if not sentiment and not emotion:
         return ""
 
-    colors = {
-        "positive": ("#dcfce7", "#16a34a"),
-        "negative": ("#fee2e2", "#dc2626"),
-        "neutral": ("#f3f4f6", "#6b7280"),
-    }
-
-    bg, text = colors.get(sentiment, ("#f3f4f6", "#6b7280"))
+    bg, text = _SENTIMENT_COLORS.get(sentiment, ("#f3f4f6", "#6b7280"))
 
     label = emotion.capitalize() if emotion else sentiment.capitalize() if sentiment else ""
     if label:
@@ -103,45 +188,20 @@ def get_sentiment_indicator(sentiment: Optional[str], emotion: Optional[str]) ->
     return ""
 
 
+@lru_cache(maxsize=64)
 def get_category_badge(category: Optional[str]) -> str:
     """Generate category badge HTML."""
     if not category:
         return ""
 
-    labels = {
-        "sales_inquiry": "Sales Inquiry",
-        "existing_order": "Existing Order",
-        "new_inquiry": "New Inquiry",
-        "complaint": "Complaint",
-        "general": "General",
-    }
-
-    label = labels.get(category, category.replace("_", " ").title())
+    label = _CATEGORY_LABELS.get(category, category.replace("_", " ").title())
     return f'<span style="background-color: #e0e7ff; color: #4338ca; padding: 4px 12px; border-radius: 9999px; font-size: 12px; font-weight: 500;">{label}</span>'
 
 
-def generate_email_html(data: VoicemailEmailData) -> str:
-    """Generate the HTML email body for a voicemail notification."""
-
-    # Format values
-    caller = format_phone(data.from_number)
-    destination = data.to_number_name or format_phone(data.to_number)
-    duration = format_duration(data.duration)
-    received = data.received_at.strftime("%d.%m.%Y um %H:%M Uhr")
-
-    # Generate badges
-    priority_badge = get_priority_badge(data.priority)
-    sentiment_badge = get_sentiment_indicator(data.sentiment, data.emotion)
-    category_badge = get_category_badge(data.category)
-
-    badges_html = " ".join(filter(None, [priority_badge, sentiment_badge, category_badge]))
-    if badges_html:
-        badges_html = f'<div style="margin-bottom: 20px;">{badges_html}</div>'
-
-    # Use corrected text if available, otherwise original transcription
-    transcript = data.corrected_text or data.transcription_text or "No transcription available."
-
-    html = f"""<!DOCTYPE html>
+# Compiled once at import; generate_email_html only fills in the per-
+# voicemail values and joins the pieces. Everything escaping-sensitive
+# is escaped before it reaches these templates.
+_HTML_TOP = """<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
@@ -193,25 +253,29 @@ def generate_email_html(data: VoicemailEmailData) -> str:
                             </table>
                         </td>
                     </tr>
+"""
 
-                    <!-- Badges -->
-                    {"<tr><td style='padding: 20px 32px 0 32px;'>" + badges_html + "</td></tr>" if badges_html else ""}
+# Emitted between _HTML_TOP and _HTML_BOTTOM only when there are badges.
+_HTML_BADGES_ROW = (
+    "\n                    <!-- Badges -->\n                    {badges_row}\n"
+)
 
+_HTML_BOTTOM = """
                     <!-- Summary -->
                     <tr>
                         <td style="padding: 24px 32px;">
                             <div style="margin-bottom: 12px; font-size: 12px; color: #6b7280; text-transform: uppercase; letter-spacing: 0.05em;">Summary</div>
                             <div style="font-size: 16px; line-height: 1.6; color: #374151; background-color: #f9fafb; padding: 16px; border-radius: 8px; border-left: 4px solid #3b82f6;">
-                                {data.summary or "No summary available."}
+                                {summary}
                             </div>
-                            {"<div style='margin-top: 12px; font-size: 14px; line-height: 1.6; color: #6b7280; font-style: italic;'><strong>English:</strong> " + data.summary_en + "</div>" if data.summary_en and data.summary_en != data.summary else ""}
+                            {summary_en_row}
                         </td>
                     </tr>
 
                     <!-- Listen Button -->
                     <tr>
                         <td style="padding: 0 32px 24px 32px;">
-                            <a href="{data.audio_url}" style="display: inline-block; background-color: #3b82f6; color: #ffffff; text-decoration: none; padding: 12px 24px; border-radius: 8px; font-weight: 600; font-size: 14px;">
+                            <a href="{audio_url}" style="display: inline-block; background-color: #3b82f6; color: #ffffff; text-decoration: none; padding: 12px 24px; border-radius: 8px; font-weight: 600; font-size: 14px;">
                                 Listen to Voicemail
                             </a>
                         </td>
@@ -231,7 +295,7 @@ def generate_email_html(data: VoicemailEmailData) -> str:
                             <table width="100%" cellpadding="0" cellspacing="0">
                                 <tr>
                                     <td style="font-size: 12px; color: #9ca3af;">
-                                        Phone App &middot; Voicemail #{data.id}
+                                        Phone App &middot; Voicemail #{vm_id}
                                     </td>
                                     <td align="right" style="font-size: 12px; color: #9ca3af;">
                                         Transcribed automatically
@@ -248,16 +312,92 @@ def generate_email_html(data: VoicemailEmailData) -> str:
 </body>
 </html>"""
 
-    return html
 
+@lru_cache(maxsize=256)
+def generate_email_html(data: VoicemailEmailData, ctx: Optional[_RenderContext] = None) -> str:
+    """Generate the HTML email body for a voicemail notification.
+
+    Memoized: a Postmark retry or a second recipient renders the identical
+    body, so repeat calls collapse to a cache lookup.
+    """
+
+    if ctx is None:
+        ctx = _build_render_context(data)
+    caller = ctx.caller
+    destination = ctx.destination
+    duration = ctx.duration
+    received = ctx.received_html
+
+    # Generate badges
+    priority_badge = get_priority_badge(data.priority)
+    sentiment_badge = get_sentiment_indicator(data.sentiment, data.emotion)
+    category_badge = get_category_badge(data.category)
+
+    badges_html = " ".join(filter(None, [priority_badge, sentiment_badge, category_badge]))
+
+    # Caller-controlled values (transcripts, LLM output derived from them,
+    # phone numbers) must never reach the HTML unescaped.
+    safe_caller = escape(caller)
+    safe_destination = escape(destination)
+    safe_summary = escape(data.summary) if data.summary else "No summary available."
+    transcript = data.corrected_text or data.transcription_text or "No transcription available."
+    safe_transcript = escape(transcript)
 
-def generate_email_plain(data: VoicemailEmailData) -> str:
+    # Build the conditional sections up front instead of inlining ternaries
+    # in the template below.
+    badges_row = ""
+    if badges_html:
+        badges_row = (
+            "<tr><td style='padding: 20px 32px 0 32px;'>"
+            f'<div style="margin-bottom: 20px;">{badges_html}</div>'
+            "</td></tr>"
+        )
+
+    summary_en_row = ""
+    if data.summary_en and data.summary_en != data.summary:
+        summary_en_row = (
+            "<div style='margin-top: 12px; font-size: 14px; line-height: 1.6; "
+            "color: #6b7280; font-style: italic;'><strong>English:</strong> "
+            f"{escape(data.summary_en)}</div>"
+        )
+
+    parts = [
+        _HTML_TOP.format(
+            received=received,
+            caller=safe_caller,
+            destination=safe_destination,
+            duration=duration,
+        )
+    ]
+    if badges_row:
+        parts.append(_HTML_BADGES_ROW.format(badges_row=badges_row))
+    parts.append(
+        _HTML_BOTTOM.format(
+            summary=safe_summary,
+            summary_en_row=summary_en_row,
+            audio_url=data.audio_url,
+            transcript=safe_transcript,
+            vm_id=data.id,
+        )
+    )
+    return "".join(parts)
+
+
+# Static separators for the plain-text body, built once at import.
+_RULE_HEAVY = "=" * 50
+_RULE_LIGHT = "-" * 50
+
+
+@lru_cache(maxsize=256)
+def generate_email_plain(data: VoicemailEmailData, ctx: Optional[_RenderContext] = None) -> str:
     """Generate plain text email body for clients that don't support HTML."""
 
-    caller = format_phone(data.from_number)
-    destination = data.to_number_name or format_phone(data.to_number)
-    duration = format_duration(data.duration)
-    received = data.received_at.strftime("%d.%m.%Y at %H:%M")
+    if ctx is None:
+        ctx = _build_render_context(data)
+    caller = ctx.caller
+    destination = ctx.destination
+    duration = ctx.duration
+    received = ctx.received_plain
     transcript = data.corrected_text or data.transcription_text or "No transcription available."
 
     lines = []
@@ -271,12 +411,12 @@ def generate_email_plain(data: VoicemailEmailData) -> str:
 
     # Header with key info
     lines.extend([
-        "=" * 50,
+        _RULE_HEAVY,
         "  NEW VOICEMAIL",
         f"  From: {caller}",
         f"  To:   {destination}",
         f"  Date: {received}  ({duration})",
-        "=" * 50,
+        _RULE_HEAVY,
         "",
     ])
 
@@ -293,7 +433,7 @@ def generate_email_plain(data: VoicemailEmailData) -> str:
     # Summary section - most important
     lines.extend([
         "SUMMARY",
-        "-" * 50,
+        _RULE_LIGHT,
         "",
         data.summary or "No summary available.",
     ])
@@ -309,15 +449,15 @@ def generate_email_plain(data: VoicemailEmailData) -> str:
         "",
         "",
         "TRANSCRIPT",
-        "-" * 50,
+        _RULE_LIGHT,
         "",
         transcript,
         "",
         "",
-        "=" * 50,
+        _RULE_HEAVY,
         f"Listen: {data.audio_url}",
         f"Callback: {caller}",
-        "=" * 50,
+        _RULE_HEAVY,
         "",
         f"Phone App | Voicemail #{data.id}",
     ])
@@ -328,10 +468,19 @@ def generate_email_plain(data: VoicemailEmailData) -> str:
 class PostmarkEmailService:
     """Service for sending voicemail notification emails via Postmark."""
 
-    def __init__(self, api_token: str, from_email: str, from_name: str = "Phone App"):
+    def __init__(
+        self,
+        api_token: str,
+        from_email: str,
+        from_name: str = "Phone App",
+        template_alias: str = "",
+    ):
         self.api_token = api_token
         self.from_email = from_email
         self.from_name = from_name
+        # When set, Postmark renders a server-side template from a small
+        # TemplateModel instead of us building ~30 KB of HTML per email.
+        self.template_alias = template_alias
 
     async def send(
         self,
@@ -344,56 +493,96 @@ class PostmarkEmailService:
         Returns the Postmark MessageID on success, or None on failure.
         """
 
-        caller = format_phone(data.from_number)
-        duration = format_duration(data.duration)
-        received = data.received_at.strftime("%d.%m.%Y %H:%M")
+        ctx = _build_render_context(data)
 
         # Build subject line with LLM-generated topic, phone, and date/time
         subject_topic = data.email_subject or "Voicemail"
-        subject = f"{subject_topic} | {caller} | {received}"
-
-        payload = {
-            "From": f"{self.from_name} <{self.from_email}>",
-            "To": to_email,
-            "Subject": subject,
-            "HtmlBody": generate_email_html(data),
-            "TextBody": generate_email_plain(data),
-            "MessageStream": "outbound",
-        }
-
-        # Optionally attach audio file
+        subject = f"{subject_topic} | {ctx.caller} | {ctx.received_short}"
+
+        if self.template_alias:
+            # Server-side rendering: ship the raw fields and let Postmark
+            # expand the template, skipping local HTML generation entirely.
+            api_url = POSTMARK_TEMPLATE_API_URL
+            payload = {
+                "From": f"{self.from_name} <{self.from_email}>",
+                "To": to_email,
+                "TemplateAlias": self.template_alias,
+                "TemplateModel": {
+                    "subject": subject,
+                    "caller": ctx.caller,
+                    "destination": ctx.destination,
+                    "duration": ctx.duration,
+                    "received": ctx.received_html,
+                    "summary": data.summary,
+                    "summary_en": data.summary_en or "",
+                    "transcript": data.corrected_text or data.transcription_text,
+                    "audio_url": data.audio_url,
+                    "sentiment": data.sentiment or "",
+                    "emotion": data.emotion or "",
+                    "category": data.category or "",
+                    "priority": data.priority or "",
+                    "voicemail_id": data.id,
+                },
+                "MessageStream": "outbound",
+            }
+        else:
+            # Render in a worker thread so a burst of concurrent sends
+            # doesn't serialize all template work on the event loop.
+            html_body, text_body = await asyncio.gather(
+                asyncio.to_thread(generate_email_html, data, ctx),
+                asyncio.to_thread(generate_email_plain, data, ctx),
+            )
+
+            api_url = POSTMARK_API_URL
+            payload = {
+                "From": f"{self.from_name} <{self.from_email}>",
+                "To": to_email,
+                "Subject": subject,
+                "HtmlBody": html_body,
+                "TextBody": text_body,
+                "MessageStream": "outbound",
+            }
+
+        # Optionally attach audio file; disk read + encode happen in a
+        # worker thread so they don't block the event loop.
         if attach_audio and data.local_file_path:
-            audio_path = Path(data.local_file_path)
-            if audio_path.exists():
-                with open(audio_path, "rb") as f:
-                    audio_content = base64.b64encode(f.read()).decode("utf-8")
-                    payload["Attachments"] = [{
-                        "Name": f"voicemail_{data.id}.mp3",
-                        "Content": audio_content,
-                        "ContentType": "audio/mpeg",
-                    }]
+            audio_content = await asyncio.to_thread(
+                _encode_audio_attachment, data.local_file_path
+            )
+            if audio_content is not None:
+                payload["Attachments"] = [{
+                    "Name": f"voicemail_{data.id}.mp3",
+                    "Content": audio_content,
+                    "ContentType": "audio/mpeg",
+                }]
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    POSTMARK_API_URL,
-                    json=payload,
-                    headers={
-                        "Accept": "application/json",
-                        "Content-Type": "application/json",
-                        "X-Postmark-Server-Token": self.api_token,
-                    },
-                    timeout=30.0,
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    message_id = result.get('MessageID')
-                    logger.info(f"Email sent to {to_email} for voicemail #{data.id} (MessageID: {message_id})")
-                    return message_id
-                else:
-                    logger.error(f"Postmark error: {response.status_code} - {response.text}")
-                    return None
+            # orjson is considerably faster than the stdlib serializer httpx
+            # would use for json=, which matters once the payload carries a
+            # multi-MB base64 attachment.
+            body = orjson.dumps(payload)
+
+            client = get_http_client()
+            response = await client.post(
+                api_url,
+                content=body,
+                headers={
+                    "Accept": "application/json",
+                    "Content-Type": "application/json",
+                    "X-Postmark-Server-Token": self.api_token,
+                },
+            )
+
+            if response.status_code == 200:
+                # Parse the raw bytes directly; response.json() would first
+                # build an intermediate str copy of the body.
+                result = orjson.loads(response.content)
+                message_id = result.get('MessageID')
+                logger.info(f"Email sent to {to_email} for voicemail #{data.id} (MessageID: {message_id})")
+                return message_id
+            else:
+                logger.error(f"Postmark error: {response.status_code} - {response.content[:500]!r}")
+                return None
 
         except Exception as e:
             logger.error(f"Failed to send email to {to_email}: {e}")
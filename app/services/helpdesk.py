@@ -5,9 +5,12 @@ This is a placeholder. Configure the actual API endpoint via settings.
 The implementation will be completed when the API details are provided.
 """
 
+import asyncio
 import logging
 from pathlib import Path
-import httpx
+import orjson
+
+from app.services.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -60,20 +63,26 @@ class HelpdeskService:
             "transcript": transcript,
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # If audio file exists, send as multipart
-            if audio_path and Path(audio_path).exists():
-                files = {"audio": open(audio_path, "rb")}
-                response = await client.post(
-                    self.api_url,
-                    data=payload,
-                    files=files,
-                )
-            else:
-                response = await client.post(
-                    self.api_url,
-                    json=payload,
-                )
+        client = get_http_client()
+
+        # If audio file exists, send as multipart
+        if audio_path and Path(audio_path).exists():
+            # Pre-read the file in a worker thread: a bare open() here leaked
+            # the handle if the request raised, and httpx would read it
+            # synchronously on the event loop.
+            audio_bytes = await asyncio.to_thread(Path(audio_path).read_bytes)
+            files = {"audio": ("voicemail.mp3", audio_bytes, "audio/mpeg")}
+            response = await client.post(
+                self.api_url,
+                data=payload,
+                files=files,
+            )
+        else:
+            response = await client.post(
+                self.api_url,
+                json=payload,
+            )
 
-            response.raise_for_status()
-            return response.json()
+        response.raise_for_status()
+        # orjson parses the raw bytes without an intermediate str copy
+        return orjson.loads(response.content)
@@ -0,0 +1,55 @@
+"""
+Shared outbound HTTP client for all external services.
+
+Placetel, ElevenLabs, OpenRouter, Postmark, and the helpdesk all talk HTTP;
+each used to hold its own keep-alive client with near-identical settings.
+One module-scoped client gives them a single connection pool (pooling is
+per-host, so the services can't contend for each other's connections) and
+one place to close at shutdown. Services with slower endpoints pass a
+per-request timeout override instead of configuring their own client.
+"""
+
+import logging
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_http_client: httpx.AsyncClient | None = None
+
+
+async def _log_request_start(request: httpx.Request):
+    request.extensions["start_time"] = time.monotonic()
+
+
+async def _log_request_end(response: httpx.Response):
+    started = response.request.extensions.get("start_time")
+    if started is not None:
+        elapsed_ms = (time.monotonic() - started) * 1000
+        logger.debug(
+            f"{response.request.method} {response.request.url.host}"
+            f"{response.request.url.path}: "
+            f"{response.status_code} in {elapsed_ms:.0f}ms"
+        )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get (lazily creating) the shared outbound HTTP client."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            event_hooks={"request": [_log_request_start], "response": [_log_request_end]},
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared client (called at app shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
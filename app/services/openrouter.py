@@ -1,10 +1,20 @@
+import asyncio
+import hashlib
+import logging
 import httpx
-from dataclasses import dataclass
-from typing import Optional
+import orjson
+from dataclasses import asdict, dataclass
+from pathlib import Path
 from app.config import get_settings
+from app.services.http_client import get_http_client
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# Completions can take longer than the shared client's default timeout
+_COMPLETION_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+
+@dataclass(frozen=True, slots=True)
 class SummaryResult:
     corrected_text: str
     summary: str  # Summary in original language
@@ -14,35 +24,40 @@ class SummaryResult:
     category: str  # sales_inquiry, existing_order, new_inquiry, complaint, general
     priority: str  # low, default, high
     email_subject: str  # Short email subject line for notifications
+    model: str = ""  # Model that actually produced this result (small-model routing)
 
 
-class OpenRouterService:
-    """LLM-powered transcript correction, summarization, and classification via OpenRouter."""
+def _summary_cache_key(model: str, language: str, transcript: str) -> str:
+    """Hash of everything that influences the LLM output."""
+    return hashlib.sha256(f"{model}|{language}|{transcript}".encode()).hexdigest()
 
-    def __init__(self):
-        self.settings = get_settings()
-        self.api_key = self.settings.openrouter_api_key
-        self.base_url = self.settings.openrouter_base_url
-        self.model = self.settings.openrouter_model
 
-    async def process_transcript(self, transcript: str, language: str = "de") -> SummaryResult:
-        """
-        Process a voicemail transcript:
-        1. Correct obvious transcription errors
-        2. Generate a concise summary for customer support
-        3. Classify sentiment, emotion, category, and urgency
-        """
-        if not self.api_key:
-            raise ValueError("OpenRouter API key not configured")
+def _summary_cache_get(key: str) -> SummaryResult | None:
+    """Look up a previously computed SummaryResult on disk, or None."""
+    path = Path(get_settings().llm_cache_path) / f"{key}.json"
+    try:
+        return SummaryResult(**orjson.loads(path.read_bytes()))
+    except (OSError, orjson.JSONDecodeError, TypeError):
+        return None
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://phone.sgos.local",
-            "X-Title": "SGOS Phone - Voicemail Processing",
-        }
 
-        system_prompt = """You are an assistant that processes voicemail transcriptions for a customer support team.
+def _summary_cache_put(key: str, result: SummaryResult):
+    """Persist a SummaryResult; best-effort, failures only get logged.
+
+    Identical transcripts (repeat test calls, duplicate webhooks, backlog
+    reprocessing) then skip the LLM round-trip entirely.
+    """
+    cache_dir = Path(get_settings().llm_cache_path)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        (cache_dir / f"{key}.json").write_bytes(orjson.dumps(asdict(result)))
+    except OSError as e:
+        logger.warning(f"Failed to write LLM cache entry: {e}")
+
+
+# Instructions are identical for every call, so the prompt lives at module
+# scope and each service instance caches the ready-made message dict.
+_SYSTEM_PROMPT = """You are an assistant that processes voicemail transcriptions for a customer support team.
 
 Your task is to:
 1. CORRECT the transcript: Fix obvious speech-to-text errors (wrong words, missing punctuation, unclear sentences). Keep the meaning intact. Keep in the original language.
@@ -92,6 +107,112 @@ Important:
 - Be conservative with high priority - only for genuinely urgent situations
 - If the transcript is very short or empty, use neutral/calm/general/default as defaults"""
 
+
+# Strict JSON schema for the model output. With schema-constrained decoding
+# the provider guarantees well-formed JSON matching SummaryResult, so the
+# parse can't fail and no fallback branch is needed.
+_RESPONSE_SCHEMA = {
+    "name": "voicemail_summary",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "corrected_text": {"type": "string"},
+            "summary": {"type": "string"},
+            "summary_en": {"type": "string"},
+            "email_subject": {"type": "string"},
+            "sentiment": {"type": "string", "enum": ["positive", "negative", "neutral"]},
+            "emotion": {"type": "string", "enum": ["angry", "frustrated", "happy", "confused", "calm", "urgent"]},
+            "category": {"type": "string", "enum": ["sales_inquiry", "existing_order", "new_inquiry", "complaint", "general"]},
+            "priority": {"type": "string", "enum": ["low", "default", "high"]},
+        },
+        "required": [
+            "corrected_text", "summary", "summary_en", "email_subject",
+            "sentiment", "emotion", "category", "priority",
+        ],
+        "additionalProperties": False,
+    },
+}
+
+
+# Cap on in-flight LLM requests when processing a batch. The shared client
+# multiplexes these over one HTTP/2 connection.
+_BATCH_CONCURRENCY = 8
+
+# Transcripts below this length carry little signal; if a small model is
+# configured they go there instead of the full-size one.
+_SHORT_TRANSCRIPT_CHARS = 200
+
+
+class OpenRouterService:
+    """LLM-powered transcript correction, summarization, and classification via OpenRouter."""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.api_key = self.settings.openrouter_api_key
+        self.base_url = self.settings.openrouter_base_url
+        self.model = self.settings.openrouter_model
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://phone.sgos.local",
+            "X-Title": "SGOS Phone - Voicemail Processing",
+        }
+        # cache_control marks the constant system prompt for provider-side
+        # prompt-prefix caching (OpenRouter forwards it to providers that
+        # support it), so its prefill is computed once and reused instead of
+        # re-billed on every call.
+        self._system_message = {
+            "role": "system",
+            "content": [
+                {
+                    "type": "text",
+                    "text": _SYSTEM_PROMPT,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+        }
+        # Optional cheaper model for short transcripts
+        self.model_small = self.settings.openrouter_model_small
+        # Everything except the user message is constant per model, so
+        # serialize one prefix per model and splice the per-call message in
+        # as bytes. "messages" must remain the last key for the trailing
+        # "]}" strip to be valid.
+        self._payload_prefixes = {
+            model: orjson.dumps({
+                "model": model,
+                "temperature": 0.3,
+                "response_format": {"type": "json_schema", "json_schema": _RESPONSE_SCHEMA},
+                "messages": [self._system_message],
+            })[:-2]
+            for model in {self.model, self.model_small or self.model}
+        }
+
+    def _pick_model(self, transcript: str) -> str:
+        """Route short transcripts to the small model when one is configured."""
+        if self.model_small and len(transcript) < _SHORT_TRANSCRIPT_CHARS:
+            return self.model_small
+        return self.model
+
+    async def process_transcript(self, transcript: str, language: str = "de") -> SummaryResult:
+        """
+        Process a voicemail transcript:
+        1. Correct obvious transcription errors
+        2. Generate a concise summary for customer support
+        3. Classify sentiment, emotion, category, and urgency
+        """
+        if not self.api_key:
+            raise ValueError("OpenRouter API key not configured")
+
+        model = self._pick_model(transcript)
+
+        # Seen this exact transcript before? Serve the cached result instead
+        # of paying seconds of LLM latency (and tokens) again.
+        cache_key = _summary_cache_key(model, language, transcript)
+        cached = _summary_cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         user_prompt = f"""Process this voicemail transcript (language: {language}):
 
 TRANSCRIPT:
@@ -99,54 +220,65 @@ TRANSCRIPT:
 
 Return JSON with corrected_text, summary (in original language), summary_en (English), email_subject, sentiment, emotion, category, and priority."""
 
-        payload = {
-            "model": self.model,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            "temperature": 0.3,
-            "response_format": {"type": "json_object"},
-        }
-
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-            )
+        user_bytes = orjson.dumps({"role": "user", "content": user_prompt})
+        body = self._payload_prefixes[model] + b"," + user_bytes + b"]}"
 
+        client = get_http_client()
+        # Stream the body into one bytearray: no httpx-internal chunk list
+        # to join afterwards, and an error response only needs its first
+        # chunk read for the log line instead of the whole completion.
+        async with client.stream(
+            "POST",
+            f"{self.base_url}/chat/completions",
+            headers=self._headers,
+            content=body,
+            timeout=_COMPLETION_TIMEOUT,
+        ) as response:
             if response.status_code != 200:
-                raise Exception(f"OpenRouter API error: {response.status_code} - {response.text}")
-
-            result = response.json()
-            content = result["choices"][0]["message"]["content"]
-
-            # Parse JSON response
-            import json
-            try:
-                parsed = json.loads(content)
-                summary = parsed.get("summary", "No summary available")
-                summary_en = parsed.get("summary_en", summary)  # Fallback to original if no translation
-                return SummaryResult(
-                    corrected_text=parsed.get("corrected_text", transcript),
-                    summary=summary,
-                    summary_en=summary_en,
-                    sentiment=parsed.get("sentiment", "neutral"),
-                    emotion=parsed.get("emotion", "calm"),
-                    category=parsed.get("category", "general"),
-                    priority=parsed.get("priority", "default"),
-                    email_subject=parsed.get("email_subject", "Voicemail"),
-                )
-            except json.JSONDecodeError:
-                # Fallback if JSON parsing fails
-                return SummaryResult(
-                    corrected_text=transcript,
-                    summary=content[:500] if content else "Processing failed",
-                    summary_en=content[:500] if content else "Processing failed",
-                    sentiment="neutral",
-                    emotion="calm",
-                    category="general",
-                    priority="default",
-                    email_subject="Voicemail",
-                )
+                snippet = b""
+                async for chunk in response.aiter_bytes():
+                    snippet = chunk[:500]
+                    break
+                raise Exception(f"OpenRouter API error: {response.status_code} - {snippet!r}")
+
+            raw = bytearray()
+            async for chunk in response.aiter_bytes():
+                raw += chunk
+
+        result = orjson.loads(raw)
+        content = result["choices"][0]["message"]["content"]
+
+        # Schema-constrained output: the provider guarantees exactly the
+        # SummaryResult fields, so construct directly instead of walking a
+        # .get() chain with defaults that can no longer trigger. A missing
+        # key raises TypeError here, surfacing a real API contract break.
+        # The routed model rides along so callers record the model that
+        # actually produced the result, not just the configured default.
+        summary_result = SummaryResult(model=model, **orjson.loads(content))
+        _summary_cache_put(cache_key, summary_result)
+        return summary_result
+
+    async def process_transcripts(
+        self, items: list[tuple[str, str]]
+    ) -> list[SummaryResult | Exception]:
+        """
+        Process a batch of (transcript, language) pairs concurrently.
+
+        Bursts (backlog reprocessing, several voicemails in one sync cycle)
+        previously paid one sequential round-trip per transcript; here the
+        requests run in parallel over the shared HTTP/2 connection, bounded
+        by a semaphore so a large backlog can't flood the API.
+
+        Results keep the input order. A failed item yields its exception
+        instead of failing the whole batch.
+        """
+        semaphore = asyncio.Semaphore(_BATCH_CONCURRENCY)
+
+        async def _one(transcript: str, language: str) -> SummaryResult:
+            async with semaphore:
+                return await self.process_transcript(transcript, language)
+
+        return await asyncio.gather(
+            *(_one(transcript, language) for transcript, language in items),
+            return_exceptions=True,
+        )
@@ -1,12 +1,36 @@
+import asyncio
 import logging
 import httpx
+import orjson
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 from app.config import get_settings
+from app.services.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
+# Read size for streaming voicemail downloads to disk.
+_DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+# Upper bound on an accepted voicemail file; even hour-long recordings stay
+# well under this, so anything bigger is a bad or hostile response and gets
+# rejected from the headers alone without pulling the body.
+MAX_VOICEMAIL_BYTES = 100 * 1024 * 1024
+
+# Per-day listing cache: {date: (etag, voicemails)}. Every cached day is
+# revalidated with If-None-Match — a 304 carries no body to transfer or
+# decode, but backfilled or corrected older days still show up. Entries
+# outside the current sync window are pruned on each listing pass.
+_day_cache: dict[str, tuple[str | None, list[dict]]] = {}
+
+# Storage directories already created this process; skips the stat+mkdir
+# syscall pair on every download after the first.
+_ensured_dirs: set[str] = set()
+
+# Downloads can outlast the shared client's default timeout on slow links
+_DOWNLOAD_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
 
 class PlacetelService:
     def __init__(self):
@@ -19,47 +43,101 @@ class PlacetelService:
 
     async def fetch_voicemail_by_id(self, external_id: str) -> Optional[dict]:
         """Fetch a single voicemail by its external ID to get a fresh signed URL."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/calls/{external_id}",
-                headers=self.headers,
-            )
+        client = get_http_client()
+        response = await client.get(
+            f"{self.base_url}/calls/{external_id}",
+            headers=self.headers,
+        )
+
+        if response.status_code == 200:
+            # Parse the raw bytes directly; response.json() would first
+            # build an intermediate str copy of the body.
+            return orjson.loads(response.content)
+        elif response.status_code == 404:
+            logger.warning(f"Voicemail {external_id} not found in Placetel API")
+            return None
+        else:
+            logger.error(f"Failed to fetch voicemail {external_id}: {response.status_code}")
+            return None
+
+    async def _fetch_day(self, date: str) -> list[dict]:
+        """Fetch one day's voicemails (those with a file_url).
+
+        A cached ETag turns the request into a conditional GET, so an
+        unchanged day costs a 304 with no body while changes (including
+        backfills on older days) are always picked up.
+        """
+        cached = _day_cache.get(date)
+        headers = self.headers
+        if cached is not None and cached[0]:
+            headers = {**self.headers, "If-None-Match": cached[0]}
+
+        response = await get_http_client().get(
+            f"{self.base_url}/calls",
+            headers=headers,
+            params={
+                "filter[date]": date,
+                "filter[type]": "voicemail",
+                "per_page": 100,
+            },
+        )
+
+        if response.status_code == 304 and cached is not None:
+            return cached[1]
+        if response.status_code in (401, 403):
+            # A dead API key fails every day the same way; raising lets
+            # iter_voicemails cancel the in-flight siblings instead of
+            # burning a request per day.
+            raise Exception(f"Placetel auth error {response.status_code} fetching {date}")
+        if response.status_code != 200:
+            return []
+        # Only include voicemails with file_url
+        voicemails = [c for c in orjson.loads(response.content) if c.get("file_url")]
+        _day_cache[date] = (response.headers.get("ETag"), voicemails)
+        return voicemails
+
+    async def iter_voicemails(self, days: int = 30):
+        """Yield voicemails from Placetel for the specified number of days.
+
+        The per-day requests run concurrently (bounded to 8 in flight) over
+        the shared client, and each day's voicemails are yielded as soon as
+        its response lands — consumers can start processing while the rest
+        of the range is still being fetched, and never hold the full
+        multi-day response in memory at once.
+        """
+        # One clock read for the whole range; date.isoformat() emits
+        # YYYY-MM-DD directly without interpreting a format string.
+        today = datetime.now().date()
+        dates = [(today - timedelta(days=d)).isoformat() for d in range(days)]
+
+        # Drop cache entries that fell out of the sync window so the cache
+        # stays bounded by the window size instead of growing per calendar
+        # day for the life of the process.
+        window = set(dates)
+        for stale in [date for date in _day_cache if date not in window]:
+            del _day_cache[stale]
+
+        sem = asyncio.Semaphore(8)
+
+        async def bounded(date: str) -> list[dict]:
+            async with sem:
+                return await self._fetch_day(date)
 
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 404:
-                logger.warning(f"Voicemail {external_id} not found in Placetel API")
-                return None
-            else:
-                logger.error(f"Failed to fetch voicemail {external_id}: {response.status_code}")
-                return None
+        tasks = [asyncio.create_task(bounded(date)) for date in dates]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                for voicemail in await completed:
+                    yield voicemail
+        finally:
+            # A failure (e.g. an auth error) or an abandoned generator
+            # cancels the remaining per-day requests instead of letting
+            # them all run to completion.
+            for task in tasks:
+                task.cancel()
 
     async def fetch_voicemails(self, days: int = 30) -> list[dict]:
-        """Fetch voicemails from Placetel API for the specified number of days."""
-        all_voicemails = []
-
-        async with httpx.AsyncClient() as client:
-            for days_ago in range(days):
-                date = (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
-                params = {
-                    "filter[date]": date,
-                    "filter[type]": "voicemail",
-                    "per_page": 100,
-                }
-
-                response = await client.get(
-                    f"{self.base_url}/calls",
-                    headers=self.headers,
-                    params=params,
-                )
-
-                if response.status_code == 200:
-                    calls = response.json()
-                    # Only include voicemails with file_url
-                    voicemails = [c for c in calls if c.get("file_url")]
-                    all_voicemails.extend(voicemails)
-
-        return all_voicemails
+        """Fetch voicemails for the specified number of days as one list."""
+        return [voicemail async for voicemail in self.iter_voicemails(days)]
 
     async def download_voicemail(
         self,
@@ -77,48 +155,113 @@ class PlacetelService:
         if storage_path is None:
             storage_path = self.settings.voicemail_storage_path
 
-        Path(storage_path).mkdir(parents=True, exist_ok=True)
+        if storage_path not in _ensured_dirs:
+            Path(storage_path).mkdir(parents=True, exist_ok=True)
+            _ensured_dirs.add(storage_path)
 
         filename = f"voicemail_{external_id}.mp3"
         local_path = Path(storage_path) / filename
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(file_url)
+        client = get_http_client()
+        url = file_url
+        # One retry with a fresh signed URL, as a loop rather than a
+        # recursive call: the second attempt reuses this frame and the
+        # already-resolved storage path.
+        for attempt in range(2):
+            # Stream straight to disk: memory stays bounded by the chunk
+            # size instead of holding the whole MP3, and the expired-URL
+            # check runs on the headers before any body bytes are consumed.
+            async with client.stream("GET", url, timeout=_DOWNLOAD_TIMEOUT) as response:
+                # Handle expired signed URLs
+                if response.status_code in (400, 403) and attempt == 0 and retry_on_expired:
+                    logger.warning(f"Signed URL expired for voicemail {external_id}, fetching fresh URL...")
 
-            # Handle expired signed URLs
-            if response.status_code in (400, 403) and retry_on_expired:
-                logger.warning(f"Signed URL expired for voicemail {external_id}, fetching fresh URL...")
+                    # Fetch fresh voicemail data with new signed URL
+                    fresh_data = await self.fetch_voicemail_by_id(external_id)
+                    if fresh_data and fresh_data.get("file_url"):
+                        url = fresh_data["file_url"]
+                        logger.info(f"Got fresh URL for voicemail {external_id}, retrying download...")
+                        continue
+                    raise Exception(f"Could not get fresh URL for voicemail {external_id}")
 
-                # Fetch fresh voicemail data with new signed URL
-                fresh_data = await self.fetch_voicemail_by_id(external_id)
-                if fresh_data and fresh_data.get("file_url"):
-                    new_url = fresh_data["file_url"]
-                    logger.info(f"Got fresh URL for voicemail {external_id}, retrying download...")
+                response.raise_for_status()
 
-                    # Retry with fresh URL (don't retry again to avoid infinite loop)
-                    return await self.download_voicemail(
-                        external_id, new_url, storage_path, retry_on_expired=False
+                content_length = int(response.headers.get("content-length", 0))
+                if content_length > MAX_VOICEMAIL_BYTES:
+                    raise Exception(
+                        f"Voicemail {external_id} is too large "
+                        f"({content_length} bytes, limit {MAX_VOICEMAIL_BYTES})"
                     )
-                else:
-                    raise Exception(f"Could not get fresh URL for voicemail {external_id}")
-
-            response.raise_for_status()
 
-            with open(local_path, "wb") as f:
-                f.write(response.content)
+                with open(local_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(_DOWNLOAD_CHUNK_BYTES):
+                        # Buffered 64 KiB writes land in the page cache; hop
+                        # to a worker thread anyway so a slow disk can't
+                        # stall the loop.
+                        await asyncio.to_thread(f.write, chunk)
+                break
 
         logger.info(f"Downloaded voicemail {external_id} to {local_path}")
         return str(local_path)
 
+    async def download_voicemails_bulk(
+        self,
+        items: list[tuple[str, str]],
+        concurrency: int = 16,
+        storage_path: Optional[str] = None,
+    ) -> list[str | Exception]:
+        """
+        Download a batch of (external_id, file_url) pairs concurrently.
+
+        Serial downloads are RTT-bound; running them through a bounded
+        gather fills the connection pool instead. Results keep input order,
+        with a failed download yielding its exception rather than aborting
+        the rest of the batch.
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(external_id: str, file_url: str) -> str:
+            async with sem:
+                return await self.download_voicemail(external_id, file_url, storage_path)
+
+        return await asyncio.gather(
+            *(one(external_id, file_url) for external_id, file_url in items),
+            return_exceptions=True,
+        )
+
+    async def _fetch_numbers_page(self, page: int) -> list[dict]:
+        """Fetch one page of phone numbers."""
+        response = await get_http_client().get(
+            f"{self.base_url}/numbers",
+            headers=self.headers,
+            params={"page": page, "per_page": 100},
+        )
+
+        if response.status_code == 200:
+            return orjson.loads(response.content)
+        return []
+
     async def fetch_numbers(self) -> list[dict]:
-        """Fetch all phone numbers from Placetel API."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/numbers",
-                headers=self.headers,
-                params={"per_page": 100},
-            )
+        """Fetch all phone numbers from Placetel API.
 
-            if response.status_code == 200:
-                return response.json()
-            return []
+        Previously a single per_page=100 request, silently truncating
+        accounts with more numbers. Remaining pages (full first page means
+        there may be more) are fetched concurrently.
+        """
+        first = await self._fetch_numbers_page(1)
+        if len(first) < 100:
+            return first
+
+        numbers = list(first)
+        page = 2
+        # No total-count header to plan from, so fetch small concurrent
+        # windows until a short (or empty) page appears.
+        while True:
+            batch = await asyncio.gather(
+                *(self._fetch_numbers_page(p) for p in range(page, page + 4))
+            )
+            for result in batch:
+                numbers.extend(result)
+            if any(len(result) < 100 for result in batch):
+                return numbers
+            page += 4
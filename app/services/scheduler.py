@@ -8,36 +8,164 @@ Jobs:
 - email_job: Send completed voicemails to helpdesk
 """
 
+import asyncio
 import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timezone
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
 
 from app.database import SessionLocal
 from app.models import Setting, Call
-from app.services.placetel import PlacetelService
-from app.services.elevenlabs import ElevenLabsService
-from app.services.openrouter import OpenRouterService
 
 logger = logging.getLogger(__name__)
 
 # Minimum duration for voicemails to be processed
 MIN_DURATION_SECONDS = 2
 
+# How many per-item network calls (downloads, transcriptions, sends) a job
+# keeps in flight at once. DB writes stay in the job's own task, so the
+# shared session is never touched concurrently.
+JOB_CONCURRENCY = 5
+
+# How many fetched voicemails the sync job accumulates before writing them
+# (and their downloads) to the database as one batch.
+SYNC_BATCH_SIZE = 100
+
+# The worklist statements are identical every cycle, so they are built once
+# at module scope; each execution then hits the engine's compiled-SQL cache
+# instead of re-constructing and re-compiling a fresh filter chain.
+_RETRY_WORKLIST = (
+    select(Call.id, Call.external_id, Call.file_url)
+    .where(
+        Call.status == "voicemail",
+        Call.transcription_status == "pending",
+        Call.local_file_path.is_(None),
+        Call.duration >= MIN_DURATION_SECONDS,
+        Call.external_id.is_not(None),
+    )
+    .limit(10)
+)
+
+_TRANSCRIBE_WORKLIST = (
+    select(Call.id, Call.local_file_path)
+    .where(
+        Call.status == "voicemail",
+        Call.transcription_status == "pending",
+        Call.local_file_path.is_not(None),
+        Call.duration >= MIN_DURATION_SECONDS,
+    )
+    .limit(10)
+)
+
+_SUMMARIZE_WORKLIST = (
+    select(Call.id, Call.transcription_text, Call.transcription_language)
+    .where(
+        Call.status == "voicemail",
+        Call.transcription_status == "completed",
+        Call.transcription_text.is_not(None),
+        Call.summary.is_(None),
+    )
+    .limit(10)
+)
+
+_EMAIL_WORKLIST = (
+    select(Call)
+    .where(
+        Call.email_status == "pending",
+        Call.summary.is_not(None),
+    )
+    .limit(10)
+)
 
-def get_setting(key: str, default: str = "") -> str:
-    """Get a setting value from the database."""
+# Session shared across one pipeline run. The jobs and setting helpers all
+# used to open their own SessionLocal, costing 10+ pool checkouts per cycle
+# for what is logically one unit of work.
+ctx_session: ContextVar[Session | None] = ContextVar("ctx_session", default=None)
+
+
+@contextmanager
+def with_session():
+    """Open one session and expose it via ctx_session for the duration."""
     db = SessionLocal()
+    token = ctx_session.set(db)
     try:
-        setting = db.query(Setting).filter(Setting.key == key).first()
-        return setting.value if setting else default
+        yield db
     finally:
+        ctx_session.reset(token)
         db.close()
 
 
+def _acquire_session() -> tuple[Session, bool]:
+    """Return (session, owned): the shared session if one is active, else a new one.
+
+    Callers close the session only when owned is True.
+    """
+    db = ctx_session.get()
+    if db is not None:
+        return db, False
+    return SessionLocal(), True
+
+# Settings change rarely but are read several times per job cycle, each read
+# previously costing a session checkout plus a SELECT. A short TTL keeps
+# out-of-band edits (e.g. direct DB changes) visible within a minute;
+# set_setting refreshes its own entry immediately.
+_SETTING_TTL_SECONDS = 60.0
+_setting_cache: dict[str, tuple[float, str | None]] = {}
+
+
+def clear_setting_cache():
+    """Drop all cached settings (for code paths that write Setting rows directly)."""
+    _setting_cache.clear()
+
+
+def get_setting(key: str, default: str = "") -> str:
+    """Get a setting value from the database (cached for a short TTL)."""
+    cached = _setting_cache.get(key)
+    if cached is not None and time.monotonic() - cached[0] < _SETTING_TTL_SECONDS:
+        return cached[1] if cached[1] is not None else default
+
+    db, owned = _acquire_session()
+    try:
+        setting = db.query(Setting).filter(Setting.key == key).first()
+        value = setting.value if setting else None
+        # Missing rows are cached too, so absent settings don't re-query
+        _setting_cache[key] = (time.monotonic(), value)
+        return value if value is not None else default
+    finally:
+        if owned:
+            db.close()
+
+
+def get_settings_bulk(keys: list[str]) -> dict[str, str]:
+    """Fetch several settings in one SELECT, warming the TTL cache.
+
+    Missing keys come back as "" and are cached as absent, so the
+    per-key get_setting calls inside the jobs all hit the cache.
+    """
+    db, owned = _acquire_session()
+    try:
+        found = dict(
+            db.query(Setting.key, Setting.value)
+            .filter(Setting.key.in_(keys))
+            .all()
+        )
+        now = time.monotonic()
+        for key in keys:
+            _setting_cache[key] = (now, found.get(key))
+        return {key: found.get(key, "") for key in keys}
+    finally:
+        if owned:
+            db.close()
+
+
 def set_setting(key: str, value: str):
     """Set a setting value in the database."""
-    db = SessionLocal()
+    db, owned = _acquire_session()
     try:
         setting = db.query(Setting).filter(Setting.key == key).first()
         if setting:
@@ -47,125 +175,193 @@ def set_setting(key: str, value: str):
             setting = Setting(key=key, value=value)
             db.add(setting)
         db.commit()
+        _setting_cache[key] = (time.monotonic(), value)
     finally:
-        db.close()
+        if owned:
+            db.close()
 
 
-def calculate_sync_days() -> int:
+def _parse_iso(value: str) -> datetime | None:
+    """Parse an ISO-8601 setting value ("Z" suffix accepted), None if unset/invalid."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def calculate_sync_days(last_sync_dt: datetime | None = None) -> int:
     """Calculate how many days back to sync based on last_sync_at.
 
     Returns days since last sync + 1 day buffer, capped at 30 days max.
-    If never synced, returns 30 days.
+    If never synced, returns 30 days. An already-parsed last_sync_dt
+    (from run_all_jobs) skips the setting read and parse.
     """
-    last_sync = get_setting("last_sync_at", "")
+    if last_sync_dt is None:
+        last_sync = get_setting("last_sync_at", "")
 
-    if not last_sync:
-        logger.info("No previous sync found, fetching last 30 days")
-        return 30
+        if not last_sync:
+            logger.info("No previous sync found, fetching last 30 days")
+            return 30
+
+        last_sync_dt = _parse_iso(last_sync)
+        if last_sync_dt is None:
+            logger.warning(f"Failed to parse last_sync_at '{last_sync}', using 7 days")
+            return 7
+
+    now = datetime.now(timezone.utc)
+    days_since = (now - last_sync_dt).days + 1  # +1 day buffer
+
+    # Clamp between 1 and 30 days
+    days = max(1, min(days_since, 30))
+    logger.info(f"Last sync: {last_sync_dt.isoformat()}, fetching last {days} days")
+    return days
 
-    try:
-        last_sync_dt = datetime.fromisoformat(last_sync.replace("Z", "+00:00"))
-        now = datetime.now(timezone.utc)
-        days_since = (now - last_sync_dt).days + 1  # +1 day buffer
-
-        # Clamp between 1 and 30 days
-        days = max(1, min(days_since, 30))
-        logger.info(f"Last sync: {last_sync_dt.isoformat()}, fetching last {days} days")
-        return days
-    except Exception as e:
-        logger.warning(f"Failed to parse last_sync_at '{last_sync}': {e}, using 7 days")
-        return 7
 
+async def run_sync_job(
+    cutoff_date: datetime | None = None,
+    last_sync_dt: datetime | None = None,
+) -> dict:
+    """Fetch new voicemails from Placetel.
+
+    run_all_jobs parses the cutoff and last-sync timestamps once per cycle
+    and passes them in; direct callers (routers) can omit them and the
+    settings are read here instead.
+    """
+    # Imported here (like the other jobs) so the service module and its
+    # HTTP stack only load in processes that actually run the pipeline
+    from app.services.placetel import PlacetelService
 
-async def run_sync_job() -> dict:
-    """Fetch new voicemails from Placetel."""
     logger.info("Starting sync job...")
-    db = SessionLocal()
+    db, owned = _acquire_session()
     try:
         placetel = PlacetelService()
-        days = calculate_sync_days()
-        voicemails = await placetel.fetch_voicemails(days=days)
-
-        # Get email cutoff date - voicemails before this date should not be emailed
-        email_only_after = get_setting("email_only_after", "")
-        cutoff_date = None
-        if email_only_after:
-            try:
-                cutoff_date = datetime.fromisoformat(email_only_after.replace("Z", "+00:00"))
-                logger.info(f"Email cutoff date for sync: {cutoff_date.isoformat()}")
-            except Exception:
-                pass
+        days = calculate_sync_days(last_sync_dt)
+
+        # Email cutoff date - voicemails before this date should not be emailed
+        if cutoff_date is None:
+            cutoff_date = _parse_iso(get_setting("email_only_after", ""))
+        if cutoff_date:
+            logger.info(f"Email cutoff date for sync: {cutoff_date.isoformat()}")
 
         new_count = 0
         downloaded_count = 0
         skipped_by_cutoff = 0
 
-        for vm_data in voicemails:
-            external_id = str(vm_data["id"])
-            existing = db.query(Call).filter(
-                Call.external_id == external_id,
-                Call.provider == "placetel"
-            ).first()
-
-            if existing:
-                continue  # Already have this one
-
-            to_number = vm_data.get("to_number", {})
-            duration = vm_data.get("duration") or 0
-
-            # Parse voicemail timestamp
-            started_at = None
-            if vm_data.get("received_at"):
-                started_at = datetime.fromisoformat(vm_data["received_at"].replace("Z", "+00:00"))
-
-            # Determine initial status
-            if duration < MIN_DURATION_SECONDS:
-                initial_status = "skipped"
-                initial_text = "[Too short]" if duration > 0 else "[No audio]"
-            else:
-                initial_status = "pending"
-                initial_text = None
-
-            # Determine email status - apply cutoff check here
-            if initial_status != "pending":
-                email_status = "skipped"
-            elif cutoff_date and started_at and started_at < cutoff_date:
-                # Voicemail is before cutoff date - skip email
-                email_status = "skipped"
-                skipped_by_cutoff += 1
-                logger.debug(f"Voicemail {external_id} before cutoff date, email skipped")
-            else:
-                email_status = "pending"
-
-            call = Call(
-                external_id=external_id,
-                provider="placetel",
-                direction="in",
-                status="voicemail",
-                from_number=vm_data.get("from_number"),
-                to_number=to_number.get("number") if isinstance(to_number, dict) else to_number,
-                to_number_name=to_number.get("name") if isinstance(to_number, dict) else None,
-                duration=duration,
-                started_at=started_at,
-                file_url=vm_data.get("file_url"),
-                unread=vm_data.get("unread", True),
-                transcription_status=initial_status,
-                transcription_text=initial_text,
-                email_status=email_status,
-            )
-            db.add(call)
-            new_count += 1
-
-            # Download audio if worth processing
-            if duration >= MIN_DURATION_SECONDS and vm_data.get("file_url"):
-                try:
-                    local_path = await placetel.download_voicemail(external_id, vm_data["file_url"])
-                    call.local_file_path = local_path
-                    downloaded_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to download voicemail {external_id}: {e}")
-
-        db.commit()
+        async def _flush(batch: list[dict]):
+            """Dedup, download, and persist one batch of fetched voicemails."""
+            nonlocal new_count, downloaded_count, skipped_by_cutoff
+
+            to_download: list[tuple[Call, str, str]] = []
+            new_calls: list[Call] = []
+
+            # One SELECT for the batch's dedup check instead of one per
+            # voicemail; a 30-day backfill was spending most of its time on
+            # those lookups. Earlier batches are already committed, so this
+            # also catches cross-batch duplicates.
+            batch_ids = [str(vm_data["id"]) for vm_data in batch]
+            existing_ids = {
+                row[0]
+                for row in db.query(Call.external_id)
+                .filter(
+                    Call.provider == "placetel",
+                    Call.external_id.in_(batch_ids),
+                )
+                .all()
+            }
+
+            for vm_data in batch:
+                external_id = str(vm_data["id"])
+                if external_id in existing_ids:
+                    continue  # Already have this one
+
+                to_number = vm_data.get("to_number", {})
+                duration = vm_data.get("duration") or 0
+
+                # Parse voicemail timestamp
+                started_at = None
+                if vm_data.get("received_at"):
+                    started_at = datetime.fromisoformat(vm_data["received_at"].replace("Z", "+00:00"))
+
+                # Determine initial status
+                if duration < MIN_DURATION_SECONDS:
+                    initial_status = "skipped"
+                    initial_text = "[Too short]" if duration > 0 else "[No audio]"
+                else:
+                    initial_status = "pending"
+                    initial_text = None
+
+                # Determine email status - apply cutoff check here
+                if initial_status != "pending":
+                    email_status = "skipped"
+                elif cutoff_date and started_at and started_at < cutoff_date:
+                    # Voicemail is before cutoff date - skip email
+                    email_status = "skipped"
+                    skipped_by_cutoff += 1
+                    logger.debug(f"Voicemail {external_id} before cutoff date, email skipped")
+                else:
+                    email_status = "pending"
+
+                call = Call(
+                    external_id=external_id,
+                    provider="placetel",
+                    direction="in",
+                    status="voicemail",
+                    from_number=vm_data.get("from_number"),
+                    to_number=to_number.get("number") if isinstance(to_number, dict) else to_number,
+                    to_number_name=to_number.get("name") if isinstance(to_number, dict) else None,
+                    duration=duration,
+                    started_at=started_at,
+                    file_url=vm_data.get("file_url"),
+                    unread=vm_data.get("unread", True),
+                    transcription_status=initial_status,
+                    transcription_text=initial_text,
+                    email_status=email_status,
+                )
+                new_calls.append(call)
+                # Guards against the same voicemail appearing twice in one
+                # batch (the old per-row SELECT caught this via autoflush)
+                existing_ids.add(external_id)
+                new_count += 1
+
+                # Queue audio download if worth processing
+                if duration >= MIN_DURATION_SECONDS and vm_data.get("file_url"):
+                    to_download.append((call, external_id, vm_data["file_url"]))
+
+            # Download concurrently instead of one RTT at a time, then assign
+            # paths back on the session in this task.
+            if to_download:
+                results = await placetel.download_voicemails_bulk(
+                    [(external_id, file_url) for _, external_id, file_url in to_download],
+                    concurrency=JOB_CONCURRENCY,
+                )
+                for (call, external_id, _), result in zip(to_download, results):
+                    if isinstance(result, BaseException):
+                        logger.error(f"Failed to download voicemail {external_id}: {result}")
+                    else:
+                        call.local_file_path = result
+                        downloaded_count += 1
+
+            # The rows are still plain Python objects at this point
+            # (downloads included their paths above), so a bulk save skips
+            # the per-object unit-of-work tracking that db.add + flush
+            # would pay.
+            if new_calls:
+                db.bulk_save_objects(new_calls)
+            db.commit()
+
+        # Consume the listing as a stream in batches: memory stays bounded
+        # by the batch size rather than the whole multi-day response, and
+        # the first downloads start before the later days have answered.
+        batch: list[dict] = []
+        async for vm_data in placetel.iter_voicemails(days=days):
+            batch.append(vm_data)
+            if len(batch) >= SYNC_BATCH_SIZE:
+                await _flush(batch)
+                batch = []
+        if batch:
+            await _flush(batch)
 
         # Update last sync time
         set_setting("last_sync_at", datetime.now(timezone.utc).isoformat())
@@ -175,9 +371,15 @@ async def run_sync_job() -> dict:
 
     except Exception as e:
         logger.error(f"Sync job failed: {e}")
+        # The session may be shared with the rest of the cycle; a failed
+        # flush (e.g. a unique-constraint race with the webhook) leaves it
+        # aborted, and without a rollback every later job would die with
+        # PendingRollbackError.
+        db.rollback()
         return {"error": str(e)}
     finally:
-        db.close()
+        if owned:
+            db.close()
 
 
 async def run_retry_downloads_job() -> dict:
@@ -192,20 +394,15 @@ async def run_retry_downloads_job() -> dict:
     The PlacetelService.download_voicemail() will automatically fetch a fresh
     signed URL from the API if the stored URL has expired.
     """
+    from app.services.placetel import PlacetelService
+
     logger.info("Starting retry downloads job...")
-    db = SessionLocal()
+    db, owned = _acquire_session()
     try:
-        # Find voicemails that need downloading
-        pending = (
-            db.query(Call)
-            .filter(Call.status == "voicemail")
-            .filter(Call.transcription_status == "pending")
-            .filter(Call.local_file_path.is_(None))
-            .filter(Call.duration >= MIN_DURATION_SECONDS)
-            .filter(Call.external_id.isnot(None))
-            .limit(10)
-            .all()
-        )
+        # Find voicemails that need downloading. Column-only query: the
+        # worklist needs three fields, not the full row with its TEXT
+        # transcription/summary columns hydrated into ORM objects.
+        pending = db.execute(_RETRY_WORKLIST).all()
 
         if not pending:
             return {"retried": 0, "success": 0}
@@ -214,30 +411,41 @@ async def run_retry_downloads_job() -> dict:
         success = 0
         failed = 0
 
-        for call in pending:
-            try:
-                logger.info(f"Retrying download for voicemail {call.id} (external_id={call.external_id})")
-
-                # Try with stored URL first, will auto-refresh if expired
-                file_url = call.file_url
-                if not file_url:
-                    # No stored URL, fetch from API
-                    fresh_data = await placetel.fetch_voicemail_by_id(call.external_id)
-                    if fresh_data and fresh_data.get("file_url"):
-                        file_url = fresh_data["file_url"]
-                        call.file_url = file_url
-                    else:
-                        logger.warning(f"No file_url available for voicemail {call.id}")
-                        continue
-
-                local_path = await placetel.download_voicemail(call.external_id, file_url)
-                call.local_file_path = local_path
+        # Resolve missing URLs first (rare), then download the batch
+        # concurrently; download_voicemail still auto-refreshes expired URLs.
+        to_download = []
+        for row in pending:
+            logger.info(f"Retrying download for voicemail {row.id} (external_id={row.external_id})")
+
+            file_url = row.file_url
+            url_refreshed = False
+            if not file_url:
+                # No stored URL, fetch from API
+                fresh_data = await placetel.fetch_voicemail_by_id(row.external_id)
+                if fresh_data and fresh_data.get("file_url"):
+                    file_url = fresh_data["file_url"]
+                    url_refreshed = True
+                else:
+                    logger.warning(f"No file_url available for voicemail {row.id}")
+                    continue
+            to_download.append((row, file_url, url_refreshed))
+
+        if to_download:
+            results = await placetel.download_voicemails_bulk(
+                [(row.external_id, file_url) for row, file_url, _ in to_download],
+                concurrency=JOB_CONCURRENCY,
+            )
+            for (row, file_url, url_refreshed), result in zip(to_download, results):
+                if isinstance(result, BaseException):
+                    logger.error(f"Failed to retry download for voicemail {row.id}: {result}")
+                    failed += 1
+                    continue
+                values = {"local_file_path": result}
+                if url_refreshed:
+                    values["file_url"] = file_url
+                db.execute(update(Call).where(Call.id == row.id).values(**values))
                 success += 1
-                logger.info(f"Successfully downloaded voicemail {call.id}")
-
-            except Exception as e:
-                logger.error(f"Failed to retry download for voicemail {call.id}: {e}")
-                failed += 1
+                logger.info(f"Successfully downloaded voicemail {row.id}")
 
         db.commit()
         logger.info(f"Retry downloads complete: {success} success, {failed} failed")
@@ -245,9 +453,12 @@ async def run_retry_downloads_job() -> dict:
 
     except Exception as e:
         logger.error(f"Retry downloads job failed: {e}")
+        # Leave the (possibly shared) session usable for later jobs
+        db.rollback()
         return {"error": str(e)}
     finally:
-        db.close()
+        if owned:
+            db.close()
 
 
 async def run_transcribe_job() -> dict:
@@ -255,18 +466,15 @@ async def run_transcribe_job() -> dict:
     if get_setting("auto_transcribe", "true") != "true":
         return {"skipped": "auto_transcribe disabled"}
 
+    # Imported after the gate so a disabled pipeline never loads the SDK
+    from app.services.elevenlabs import ElevenLabsService
+
     logger.info("Starting transcribe job...")
-    db = SessionLocal()
+    db, owned = _acquire_session()
     try:
-        pending = (
-            db.query(Call)
-            .filter(Call.status == "voicemail")
-            .filter(Call.transcription_status == "pending")
-            .filter(Call.local_file_path.isnot(None))
-            .filter(Call.duration >= MIN_DURATION_SECONDS)
-            .limit(10)
-            .all()
-        )
+        # Column-only worklist (see the retry/summarize jobs): the job only
+        # needs the id and the audio path.
+        pending = db.execute(_TRANSCRIBE_WORKLIST).all()
 
         if not pending:
             return {"transcribed": 0}
@@ -275,33 +483,59 @@ async def run_transcribe_job() -> dict:
         transcribed = 0
         failed = 0
 
-        for call in pending:
-            try:
-                call.transcription_status = "processing"
-                db.commit()
-
-                result = await elevenlabs.transcribe(call.local_file_path)
-
-                call.transcription_text = result.text
-                call.transcription_language = result.language
-                call.transcription_confidence = result.confidence
-                call.transcription_model = result.model
-                call.transcription_status = "completed"
-                call.transcribed_at = datetime.now(timezone.utc)
-                transcribed += 1
-                logger.info(f"Transcribed voicemail {call.id}")
-
-            except Exception as e:
-                logger.error(f"Failed to transcribe voicemail {call.id}: {e}")
-                call.transcription_status = "failed"
+        # Claim the whole batch with one atomic UPDATE (one fsync instead of
+        # a commit per row), then let the transcription calls overlap.
+        db.execute(
+            update(Call)
+            .where(Call.id.in_([row.id for row in pending]))
+            .values(transcription_status="processing")
+        )
+        db.commit()
+
+        sem = asyncio.Semaphore(JOB_CONCURRENCY)
+
+        async def _transcribe(path: str):
+            async with sem:
+                return await elevenlabs.transcribe(path)
+
+        results = await asyncio.gather(
+            *(_transcribe(row.local_file_path) for row in pending),
+            return_exceptions=True,
+        )
+
+        for row, result in zip(pending, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to transcribe voicemail {row.id}: {result}")
+                db.execute(
+                    update(Call)
+                    .where(Call.id == row.id)
+                    .values(transcription_status="failed")
+                )
                 failed += 1
+                continue
+
+            db.execute(
+                update(Call)
+                .where(Call.id == row.id)
+                .values(
+                    transcription_text=result.text,
+                    transcription_language=result.language,
+                    transcription_confidence=result.confidence,
+                    transcription_model=result.model,
+                    transcription_status="completed",
+                    transcribed_at=datetime.now(timezone.utc),
+                )
+            )
+            transcribed += 1
+            logger.info(f"Transcribed voicemail {row.id}")
 
         db.commit()
         logger.info(f"Transcribe complete: {transcribed} done, {failed} failed")
         return {"transcribed": transcribed, "failed": failed}
 
     finally:
-        db.close()
+        if owned:
+            db.close()
 
 
 async def run_summarize_job() -> dict:
@@ -309,21 +543,17 @@ async def run_summarize_job() -> dict:
     if get_setting("auto_summarize", "true") != "true":
         return {"skipped": "auto_summarize disabled"}
 
+    from app.services.openrouter import OpenRouterService
+
     logger.info("Starting summarize job...")
-    db = SessionLocal()
+    db, owned = _acquire_session()
     try:
-        skip_texts = ["[No audio]", "[Too short]", "[No audio content]"]
-
-        pending = (
-            db.query(Call)
-            .filter(Call.status == "voicemail")
-            .filter(Call.transcription_status == "completed")
-            .filter(Call.transcription_text.isnot(None))
-            .filter(Call.summary.is_(None))
-            .filter(Call.transcription_text.notin_(skip_texts))
-            .limit(10)
-            .all()
-        )
+        # Column-only worklist: the job dispatches on three fields and
+        # writes results back with targeted UPDATEs, so no full rows (with
+        # every TEXT column) are hydrated. No skip-text filter needed:
+        # placeholder rows ("[Too short]" etc.) are created with
+        # transcription_status='skipped' and never reach 'completed'.
+        pending = db.execute(_SUMMARIZE_WORKLIST).all()
 
         if not pending:
             return {"summarized": 0}
@@ -332,46 +562,71 @@ async def run_summarize_job() -> dict:
         summarized = 0
         failed = 0
 
-        for call in pending:
+        to_process = []
+        for row in pending:
             # Skip very short transcripts
-            if len(call.transcription_text.strip()) < 20:
-                call.summary = "[No meaningful content]"
-                call.summarized_at = datetime.now(timezone.utc)
+            if len(row.transcription_text.strip()) < 20:
+                db.execute(
+                    update(Call)
+                    .where(Call.id == row.id)
+                    .values(
+                        summary="[No meaningful content]",
+                        summarized_at=datetime.now(timezone.utc),
+                    )
+                )
+                continue
+            to_process.append(row)
+
+        # The LLM calls run concurrently (bounded inside process_transcripts);
+        # results come back in input order with failures in place.
+        results = []
+        if to_process:
+            results = await openrouter.process_transcripts([
+                (row.transcription_text, row.transcription_language or "de")
+                for row in to_process
+            ])
+
+        for row, result in zip(to_process, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to summarize voicemail {row.id}: {result}")
+                failed += 1
                 continue
 
-            try:
-                result = await openrouter.process_transcript(
-                    transcript=call.transcription_text,
-                    language=call.transcription_language or "de",
+            db.execute(
+                update(Call)
+                .where(Call.id == row.id)
+                .values(
+                    corrected_text=result.corrected_text,
+                    summary=result.summary,
+                    summary_en=result.summary_en,
+                    summary_model=result.model,
+                    summarized_at=datetime.now(timezone.utc),
+                    sentiment=result.sentiment,
+                    emotion=result.emotion,
+                    category=result.category,
+                    priority=result.priority,
+                    email_subject=result.email_subject,
                 )
-
-                call.corrected_text = result.corrected_text
-                call.summary = result.summary
-                call.summary_en = result.summary_en
-                call.summary_model = openrouter.model
-                call.summarized_at = datetime.now(timezone.utc)
-                call.sentiment = result.sentiment
-                call.emotion = result.emotion
-                call.category = result.category
-                call.priority = result.priority
-                call.email_subject = result.email_subject
-                summarized += 1
-                logger.info(f"Summarized voicemail {call.id} (sentiment={result.sentiment}, priority={result.priority})")
-
-            except Exception as e:
-                logger.error(f"Failed to summarize voicemail {call.id}: {e}")
-                failed += 1
+            )
+            summarized += 1
+            logger.info(f"Summarized voicemail {row.id} (sentiment={result.sentiment}, priority={result.priority})")
 
         db.commit()
         logger.info(f"Summarize complete: {summarized} done, {failed} failed")
         return {"summarized": summarized, "failed": failed}
 
     finally:
-        db.close()
+        if owned:
+            db.close()
 
 
-async def run_email_job() -> dict:
-    """Send voicemail notification emails via Postmark."""
+async def run_email_job(cutoff_date: datetime | None = None) -> dict:
+    """Send voicemail notification emails via Postmark.
+
+    cutoff_date (only email voicemails received after it) comes pre-parsed
+    from run_all_jobs; direct callers can omit it and the setting is read
+    here instead.
+    """
     from app.config import get_settings
     from app.services.email import PostmarkEmailService, voicemail_to_email_data
 
@@ -386,30 +641,19 @@ async def run_email_job() -> dict:
     if not settings.postmark_api_token or not settings.email_from:
         return {"skipped": "Postmark not configured (missing token or from email)"}
 
-    # Check cutoff date - only email voicemails received after this date
-    email_only_after = get_setting("email_only_after", "")
-    cutoff_date = None
-    if email_only_after:
-        try:
-            cutoff_date = datetime.fromisoformat(email_only_after.replace("Z", "+00:00"))
-        except Exception:
-            pass
+    if cutoff_date is None:
+        cutoff_date = _parse_iso(get_setting("email_only_after", ""))
 
     logger.info("Starting email job...")
-    db = SessionLocal()
+    db, owned = _acquire_session()
     try:
-        query = (
-            db.query(Call)
-            .filter(Call.email_status == "pending")
-            .filter(Call.summary.isnot(None))
-        )
-
+        stmt = _EMAIL_WORKLIST
         # Apply cutoff date filter if set
         if cutoff_date:
-            query = query.filter(Call.started_at >= cutoff_date)
+            stmt = stmt.where(Call.started_at >= cutoff_date)
             logger.info(f"Email cutoff date: {cutoff_date.isoformat()}")
 
-        pending = query.limit(10).all()
+        pending = db.execute(stmt).scalars().all()
 
         if not pending:
             return {"sent": 0}
@@ -418,20 +662,29 @@ async def run_email_job() -> dict:
             api_token=settings.postmark_api_token,
             from_email=settings.email_from,
             from_name=settings.email_from_name,
+            template_alias=settings.postmark_template_alias,
         )
 
         sent = 0
         failed = 0
 
-        for call in pending:
-            email_data = voicemail_to_email_data(call, settings.base_url)
+        # Build the payloads on the session in this task, then let the
+        # Postmark sends overlap; send() already returns None on failure.
+        email_payloads = [voicemail_to_email_data(call, settings.base_url) for call in pending]
 
-            message_id = await email_service.send(
-                to_email=to_email,
-                data=email_data,
-                attach_audio=False,  # Link only, no attachment
-            )
+        sem = asyncio.Semaphore(JOB_CONCURRENCY)
 
+        async def _send(email_data):
+            async with sem:
+                return await email_service.send(
+                    to_email=to_email,
+                    data=email_data,
+                    attach_audio=False,  # Link only, no attachment
+                )
+
+        message_ids = await asyncio.gather(*(_send(data) for data in email_payloads))
+
+        for call, message_id in zip(pending, message_ids):
             if message_id:
                 call.email_status = "sent"
                 call.email_sent_at = datetime.now(timezone.utc)
@@ -446,16 +699,56 @@ async def run_email_job() -> dict:
         return {"sent": sent, "failed": failed}
 
     finally:
-        db.close()
+        if owned:
+            db.close()
+
+
+async def _run_in_own_session(job, *args, **kwargs):
+    """Run one job on a fresh session in the task's own context.
+
+    A Session is not safe for interleaved use from concurrent tasks (one
+    job's commit would flush the other's half-done changes), so jobs that
+    run in parallel each get their own instead of the shared ctx_session.
+    """
+    with with_session():
+        return await job(*args, **kwargs)
 
 
 async def run_all_jobs():
-    """Run all processing jobs in sequence."""
-    await run_sync_job()
-    await run_retry_downloads_job()  # Retry any failed downloads with fresh URLs
-    await run_transcribe_job()
-    await run_summarize_job()
-    await run_email_job()
+    """Run the processing jobs, overlapping the independent ones.
+
+    The pipeline is a dependency chain: sync produces the rows, transcribe
+    feeds summarize feeds email, so a new voicemail is emailed in the same
+    cycle it arrives. Only retry-downloads is independent of that chain
+    (its recovered files get transcribed next cycle either way), so it runs
+    concurrently with transcribe/summarize.
+    """
+    with with_session():
+        # One SELECT warms the setting cache for every read the jobs below do
+        values = get_settings_bulk([
+            "last_sync_at",
+            "email_only_after",
+            "auto_transcribe",
+            "auto_summarize",
+            "auto_email",
+            "notification_email",
+        ])
+        # Parse the timestamp settings once and thread them through instead
+        # of each job re-running fromisoformat on the same strings
+        cutoff_date = _parse_iso(values["email_only_after"])
+        last_sync_dt = _parse_iso(values["last_sync_at"])
+
+        await run_sync_job(cutoff_date=cutoff_date, last_sync_dt=last_sync_dt)
+
+        async def _transcribe_then_summarize():
+            await run_transcribe_job()
+            await run_summarize_job()
+
+        await asyncio.gather(
+            _run_in_own_session(run_retry_downloads_job),
+            _transcribe_then_summarize(),
+        )
+        await run_email_job(cutoff_date=cutoff_date)
 
 
 def reschedule_sync_job(scheduler: AsyncIOScheduler, interval_minutes: int):
@@ -470,6 +763,9 @@ def reschedule_sync_job(scheduler: AsyncIOScheduler, interval_minutes: int):
         IntervalTrigger(minutes=interval_minutes),
         id="sync_job",
         replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=60,
     )
     logger.info(f"Rescheduled sync job to run every {interval_minutes} minutes")
 
@@ -481,12 +777,18 @@ async def create_scheduler() -> AsyncIOScheduler:
     # Get interval from settings (default 5 minutes for faster voicemail pickup)
     interval = int(get_setting("sync_interval_minutes", "5"))
 
-    # Add the main processing job
+    # Add the main processing job. max_instances=1 + coalesce means a cycle
+    # that overruns its interval never overlaps with the next one (which
+    # would double the Placetel/ElevenLabs calls and risk duplicate emails);
+    # missed fires collapse into a single run.
     scheduler.add_job(
         run_all_jobs,
         IntervalTrigger(minutes=interval),
         id="sync_job",
         replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=60,
     )
 
     scheduler.start()